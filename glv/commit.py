@@ -19,6 +19,7 @@
 #
 ''' New core api objects '''
 
+import functools
 import logging
 from collections import namedtuple
 from datetime import datetime, timezone
@@ -143,14 +144,10 @@ def parse_commit(working_dir: str,
     if above_commit:
         above = above_commit.oid
 
-    git_cmd = git.cmd.Git(working_dir)
     is_fork_point = False
     if above_commit and above_commit.children and above_commit.level == level:
-        try:
-            git_cmd.merge_base(oid, above_commit.children[0], is_ancestor=True)
-            is_fork_point = True
-        except git.GitCommandError:
-            pass
+        is_fork_point = is_ancestor(working_dir, oid,
+                                    above_commit.children[0])
 
     if parents:
         bellow = parents[0]
@@ -233,6 +230,18 @@ def commits_for_range(  # pylint: disable=too-many-arguments
     return result
 
 
+@functools.lru_cache(maxsize=None)
+def is_ancestor(working_dir: str, oid: str, descendant: str) -> bool:
+    ''' Return true if oid is an ancestor of descendant '''
+    git_cmd = git.cmd.Git(working_dir=working_dir)
+    try:
+        git_cmd.merge_base(oid, descendant, is_ancestor=True)
+        return True
+    except git.GitCommandError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
 def merge_base(working_dir: str, *oids) -> Optional[str]:
     ''' Return the mergebase commit id '''
     git_cmd = git.cmd.Git(working_dir=working_dir)
@@ -56,7 +56,7 @@ from pygments.styles.solarized import SolarizedDarkStyle
 
 from glv.ui.diff_view import DiffView
 from glv.ui.history import HistoryContainer
-from glv.utils import screen_height, screen_width
+from glv.utils import reset_screen_size, screen_height, screen_width
 
 
 def parse_args() -> dict:
@@ -356,7 +356,8 @@ def cli():
                       layout=LAYOUT,
                       style=patched_style(),
                       color_depth=ColorDepth.TRUE_COLOR,
-                      key_bindings=KG)
+                      key_bindings=KG,
+                      before_render=reset_screen_size)
     app.editing_mode = EditingMode.VI
     app.run()
     shortcuts.clear_title()
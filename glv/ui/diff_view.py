@@ -101,16 +101,16 @@ class DiffControl(BufferControl):
         body: str = git_cmd.diff('--stat', '-p', '-M', '--no-color',
                                  '--full-index',
                                  '%s..%s' % (commit.bellow, commit.oid))
-        text = ""
-
-        text += "Commit:     %s\n" % commit.oid
-        text += "Author:     %s\n" % commit.author_name
-        text += "AuthorDate: %s\n" % commit.author_date
+        lines = [
+            "Commit:     %s" % commit.oid,
+            "Author:     %s" % commit.author_name,
+            "AuthorDate: %s" % commit.author_date,
+        ]
 
         if commit.committer_name != commit.author_name:
-            text += "Committer:     %s\n" % commit.committer_name
+            lines.append("Committer:     %s" % commit.committer_name)
         if commit.committer_date != commit.author_date:
-            text += "CommitDate: %s\n" % commit.committer_date
+            lines.append("CommitDate: %s" % commit.committer_date)
 
         changes: ModuleChanges = mod_changes(working_dir)
         monorepo_modules = changes.commit_modules(commit)
@@ -120,32 +120,31 @@ class DiffControl(BufferControl):
             width = 70
             if screen_width() < width:
                 width = screen_width()
-            wrapped = textwrap.wrap("Modules:    %s" % modules,
-                                    break_long_words=False,
-                                    break_on_hyphens=False,
-                                    subsequent_indent='Modules:    ',
-                                    width=width)
-            text += '\n'.join(wrapped) + '\n'
+            lines += textwrap.wrap("Modules:    %s" % modules,
+                                   break_long_words=False,
+                                   break_on_hyphens=False,
+                                   subsequent_indent='Modules:    ',
+                                   width=width)
 
         refs = ["«%s»" % name for name in commit.references if name != '']
         if refs:
-            text += "Refs:       %s\n" % ", ".join(refs)
+            lines.append("Refs:       %s" % ", ".join(refs))
         # pylint: disable=protected-access
-        text += "\n"
+        lines.append("")
         body_lines = commit.subject.replace('\r', '').split("\n")
-        text += " " + body_lines[0] + "\n"
+        lines.append(" " + body_lines[0])
         body_lines = body_lines[1:]
         if body_lines and body_lines[0] == '' and len(body_lines) == 1:
             body_lines = body_lines[1:]
-        if body_lines:
-            text += "\n".join([" " + l for l in body_lines]) + "\n"
+        lines += [" " + l for l in body_lines]
 
-        text += "\n " + 26 * ' ' + "❦ ❦ ❦ ❦ \n\n"
+        lines += ["", " " + 26 * ' ' + "❦ ❦ ❦ ❦ ", ""]
 
         if body is None:
             body = "‼ Missing data for commit %s and failed to fetch it." % commit.oid
 
-        text += body
+        lines.append(body)
+        text = "\n".join(lines)
         doc = DiffDocument(text, cursor_position=0)
 
         self.buffer.set_document(doc, bypass_readonly=True)
@@ -20,9 +20,10 @@
 #
 import logging
 import os
+import re
 import sys
-from threading import Thread
-from typing import Any, List, Optional
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
 
 from prompt_toolkit import shortcuts
 from prompt_toolkit.buffer import Buffer
@@ -36,12 +37,19 @@ from prompt_toolkit.widgets import SearchToolbar
 
 from glv import NoPathMatches, NoRevisionMatches, Repo, utils
 from glv.commit import Commit, CommitNotFound, child_history, follow, is_folded
-from glv.ui.log_entry import LogEntry
+from glv.ui.log_entry import LogEntry, search_haystack, short_author_name
 from glv.ui.status import STATUS, STATUS_WINDOW
 from glv.utils import parse_args
 
 LOG = logging.getLogger('glv')
 
+_PAD = ('', ' ')
+_PAD_REV = ('reverse ', ' ')
+
+# upper bound of commits paged in at once while searching; a search is only
+# cancelled between two page-ins, so this also bounds the cancel latency
+_MAX_SEARCH_CHUNK = 1024
+
 
 class History(UIContent):
     # pylint: disable=too-many-instance-attributes
@@ -70,9 +78,22 @@ class History(UIContent):
         self._repo = repo
         self.line_count = self._repo.count_commits(self.revision[0])
         self.commit_list: List[Commit] = []
-        self.log_entry_list: List[Commit] = []
+        # LogEntry objects are created lazily on first access, see _log_entry
+        self.log_entry_list: List[Optional[LogEntry]] = []
+        # number of loaded top level commits, used for paging in more
+        self._level0_count = 0
+        # index of the visual parent of each commit, filled up on demand
+        self._parent_index: List[int] = []
+        # ancestor chain of the last commit in _parent_index
+        self._level_stack: List[int] = []
+        # children commits of already unfolded merges
+        self._children_cache: Dict[Tuple[str, int], List[Commit]] = {}
         self.search_state: Optional[SearchState] = None
         self._search_thread: Optional[Thread] = None
+        self._cancel_search = Event()
+        # serializes mutations of commit_list between the UI and the search
+        # threads
+        self._fill_lock = Lock()
         super().__init__(line_count=self.line_count,
                          get_line=self.get_line,
                          show_cursor=False)
@@ -83,14 +104,15 @@ class History(UIContent):
                      include_current_position=True,
                      count=1):
         if self._search_thread is not None and self._search_thread.is_alive():
-            try:
-                self._search_thread._stop()  # pylint: disable=protected-access
-            except Exception:  # nosec pylint: disable=broad-except
-                pass
-            finally:
-                STATUS.clear()
-
-        args = (search_state, include_current_position, count)
+            self._cancel_search.set()
+            self._search_thread.join(timeout=0.05)
+            STATUS.clear()
+
+        # every search gets its own flag, so a still running previous search
+        # can not be resumed by accident
+        self._cancel_search = Event()
+        args = (search_state, include_current_position, count,
+                self._cancel_search)
         self._search_thread = Thread(target=self.search,
                                      args=args,
                                      daemon=True)
@@ -108,30 +130,36 @@ class History(UIContent):
     def search(self,
                search_state: SearchState,
                include_current_position=True,
-               count=1):
+               count=1,
+               cancel: Optional[Event] = None):
         LOG.debug('applying search %r, %r, %r', search_state,
                   include_current_position, count)
         self.search_state = search_state
         index = self.cursor_position.y
         new_position = self.cursor_position.y
         LOG.debug('Current position %r', index)
+        cancelled = (cancel or Event()).is_set
         needle = self.search_state.text
+        match = re.compile(re.escape(needle)).search
+        commits = self.commit_list
         STATUS.set_status("Searching for '%s'" % needle)
         if self.search_state.direction == SearchDirection.FORWARD:
             if not include_current_position:
                 index += 1
+            chunk = max(256, utils.screen_height())
             while True:
+                if cancelled():
+                    return
                 try:
-                    commit = self.commit_list[index]
+                    commit = commits[index]
                 except IndexError:
-                    if not self.fill_up(utils.screen_height()):
+                    if not self.fill_up(chunk) or cancelled():
                         break
+                    chunk = min(chunk * 2, _MAX_SEARCH_CHUNK)
 
-                    commit = self.commit_list[index]
+                    commit = commits[index]
 
-                if needle in commit.short_id or needle in commit.subject \
-                        or needle in commit.author_name \
-                        or any(needle in haystack for haystack in commit.branches):
+                if match(search_haystack(commit)):
                     new_position = index
                     break
 
@@ -140,16 +168,20 @@ class History(UIContent):
             if not include_current_position and index > 0:
                 index -= 1
             while index >= 0:
-                commit = self.commit_list[index]
-                if needle in commit.short_id() or needle in commit.subject \
-                        or needle in commit.author_name():
+                if cancelled():
+                    return
+                if match(search_haystack(commits[index])):
                     new_position = index
                     break
 
                 index -= 1
 
+        if cancelled():
+            return
+
         if new_position != self.cursor_position.y:
-            self.cursor_position = Point(x=self.cursor_position.x, y=index)
+            self.cursor_position = Point(x=self.cursor_position.x,
+                                         y=new_position)
         STATUS.clear()
 
     def get_line(self, line_number: int) -> List[tuple]:  # pylint: disable=method-hidden
@@ -165,15 +197,45 @@ class History(UIContent):
 
         return self._render_commit(commit, line_number)
 
+    def _log_entry(self,
+                   index: int,
+                   commit: Optional[Commit] = None) -> LogEntry:
+        entry = self.log_entry_list[index]
+        if entry is None:
+            if commit is None:
+                commit = self.commit_list[index]
+            entry = LogEntry(commit, self.working_dir, self.search_state)
+            self.log_entry_list[index] = entry
+        return entry
+
+    def _update_column_widths(self, commits: List[Commit]) -> None:
+        if not commits:
+            return
+        date_len = max(len(x.author_rel_date) for x in commits)
+        name_len = max(len(short_author_name(x.author_name)) for x in commits)
+        if date_len > self.date_max_len:
+            self.date_max_len = date_len
+        if name_len > self.name_max_len:
+            self.name_max_len = name_len
+
     def _render_commit(self, commit: Commit, line_number: int) -> List[tuple]:
-        try:
-            entry = self.log_entry_list[line_number]
-            entry.search_state = self.search_state
-        except KeyError:
-            self.log_entry_list[line_number] = LogEntry(
-                commit, self.working_dir, self.search_state)
-            entry = self.log_entry_list[line_number]
-            entry.search_state = self.search_state
+        entry = self._log_entry(line_number, commit)
+        entry.search_state = self.search_state
+        result = self._render_base(entry)
+        if line_number == self.cursor_position.y:
+            return [
+                _PAD_REV if x is _PAD else ('reverse ' + x[0], x[1])
+                for x in result
+            ]
+        return result
+
+    def _render_base(self, entry: LogEntry) -> List[tuple]:
+        # modules are resolved asynchronously, so they are part of the key
+        search_text = self.search_state.text if self.search_state else None
+        key = (self.date_max_len, self.name_max_len, search_text,
+               entry.modules)
+        if entry.render_cache is not None and entry.render_cache[0] == key:
+            return entry.render_cache[1]
 
         tmp = [
             entry.short_id_colored,
@@ -183,17 +245,74 @@ class History(UIContent):
             entry.subject_colored, entry.references_colored
         ]
         result: List[tuple] = []
+        append = result.append
+        extend = result.extend
         for sth in tmp:
-            if isinstance(sth, tuple):
-                result += [sth, ('', ' ')]
+            if type(sth) is tuple:  # pylint: disable=unidiomatic-typecheck
+                append(sth)
             else:
-                result += sth
-                result += [('', ' ')]
-
-        if line_number == self.cursor_position.y:
-            result = [('reverse ' + x[0], x[1]) for x in result]
-
-        return [(x[0], x[1]) for x in result]
+                extend(sth)
+            append(_PAD)
+
+        entry.render_cache = (key, result)
+        return result
+
+    def follow(self, line_number: int) -> int:
+        ''' Follow the commit link at line_number and return the target line.
+
+            `glv.commit.follow` may insert and append commits to the
+            commit_list, so the derived state is rebuilt afterwards.
+        '''
+        with self._fill_lock:
+            old_length = len(self.commit_list)
+            known = set(map(id, self.commit_list))
+            result = follow(self.working_dir, self.commit_list, line_number)
+            if len(self.commit_list) != old_length:
+                new_commits = [
+                    x for x in self.commit_list if id(x) not in known
+                ]
+                self._sync_log_entries()
+                self._invalidate_parents(0)
+                self._update_column_widths(new_commits)
+
+                # inserted children are never on level 0, only the tail
+                appended = len([x for x in new_commits if x.level == 0])
+                self._level0_count += appended
+                self.line_count += len(new_commits) - appended
+        return result
+
+    def parent(self, line_number: int) -> int:
+        ''' Return the index of the nearest preceding commit with a lower
+            level or -1 if there is none.
+        '''
+        commits = self.commit_list
+        parents = self._parent_index
+        stack = self._level_stack
+        for i in range(len(parents), line_number + 1):
+            level = commits[i].level
+            while stack and commits[stack[-1]].level >= level:
+                stack.pop()
+            parents.append(stack[-1] if stack else -1)
+            stack.append(i)
+        return parents[line_number]
+
+    def _invalidate_parents(self, pos: int) -> None:
+        ''' Drop the parent indices starting at pos '''
+        del self._parent_index[pos:]
+        stack = []
+        i = len(self._parent_index) - 1
+        while i >= 0:
+            stack.append(i)
+            i = self._parent_index[i]
+        stack.reverse()
+        self._level_stack = stack
+
+    def _sync_log_entries(self) -> None:
+        entries = {
+            id(x.commit): x
+            for x in self.log_entry_list if x is not None
+        }
+        self.log_entry_list = [entries.get(id(x)) for x in self.commit_list]
 
     def toggle_fold(self, line_number):
         commit = self.commit_list[line_number]
@@ -207,46 +326,55 @@ class History(UIContent):
 
     def _fold(self, pos: int, commit: Commit) -> Any:
         LOG.info('Expected level %s', commit.level)
-        for _, cur in enumerate(self.commit_list[pos:]):
-            LOG.info('Checking %s', cur)
-            if commit.level < cur.level:
-                del self.commit_list[pos]
-                del self.log_entry_list[pos]
-            else:
-                break
+        end = pos
+        length = len(self.commit_list)
+        while end < length and commit.level < self.commit_list[end].level:
+            end += 1
+
+        with self._fill_lock:
+            del self.commit_list[pos:end]
+            del self.log_entry_list[pos:end]
+            self._invalidate_parents(pos)
+            self.line_count -= end - pos
 
     def _unfold(self, line_number: int, commit: Commit) -> Any:
-        index = 1
-        for _ in child_history(self.working_dir, commit):
-            entry = LogEntry(_, self.working_dir, self.search_state)
-            if len(entry.author_rel_date) > self.date_max_len:
-                self.date_max_len = len(entry.author_rel_date)
-            if len(entry.author_name) > self.name_max_len:
-                self.name_max_len = len(entry.author_name)
-            self.commit_list.insert(line_number + index, _)
-            self.log_entry_list.insert(line_number + index, entry)
-            index += 1
-
-        self.line_count += index
+        key = (commit.oid, commit.level)
+        try:
+            new_commits = self._children_cache[key]
+        except KeyError:
+            new_commits = child_history(self.working_dir, commit)
+            self._update_column_widths(new_commits)
+            self._children_cache[key] = new_commits
+
+        pos = line_number + 1
+        with self._fill_lock:
+            self.commit_list[pos:pos] = new_commits
+            self.log_entry_list[pos:pos] = [None] * len(new_commits)
+            self._invalidate_parents(pos)
+            self.line_count += len(new_commits)
 
     def fill_up(self, amount: int) -> int:
         if amount <= 0:
-            raise ValueError('Amount must be ≤ 0')
-
-        commits = self._repo.iter_commits(
-            rev_range=self.revision[0],
-            skip=len([x for x in self.commit_list if x.level == 0]),
-            max_count=amount,
-            paths=self.files)
-        for commit in commits:
-            self.commit_list.append(commit)
-            entry = LogEntry(commit, self.working_dir, self.search_state)
-            self.log_entry_list.append(entry)
-            if len(entry.author_rel_date) > self.date_max_len:
-                self.date_max_len = len(entry.author_rel_date)
-            if len(entry.author_name) > self.name_max_len:
-                self.name_max_len = len(entry.author_name)
-        return len(commits)
+            return 0
+
+        while True:
+            skip = self._level0_count
+            # the git call runs without the lock, so paging on one thread
+            # does not block rendering on the other one
+            commits = self._repo.iter_commits(rev_range=self.revision[0],
+                                              skip=skip,
+                                              max_count=amount,
+                                              paths=self.files)
+            with self._fill_lock:
+                if skip != self._level0_count:
+                    # another thread paged in or followed a link meanwhile
+                    continue
+                self.commit_list.extend(commits)
+                self.log_entry_list.extend([None] * len(commits))
+                self._level0_count += len(
+                    [x for x in commits if x.level == 0])
+                self._update_column_widths(commits)
+            return len(commits)
 
 
 class HistoryControl(BufferControl):
@@ -254,6 +382,7 @@ class HistoryControl(BufferControl):
                  key_bindings: Optional[KeyBindings], arguments: dict) -> None:
         buffer = Buffer(name='history')
         self.content = History(arguments)
+        self._path: str = self.content.path
         buffer.apply_search = self.content.apply_search  # type: ignore
         super().__init__(buffer=buffer,
                          search_buffer_control=search_buffer_control,
@@ -328,13 +457,9 @@ class HistoryControl(BufferControl):
     def go_to_parent(self, line_number: int):
         commit = self.content.commit_list[line_number]
         if commit.level > 0 and line_number > 0:
-            i = line_number - 1
-            while i >= 0:
-                candidat = self.content.commit_list[i]
-                if candidat.level < commit.level:
-                    self.goto_line(i)
-                    break
-                i -= 1
+            parent = self.content.parent(line_number)
+            if parent >= 0:
+                self.goto_line(parent)
 
     def is_link(self, line_number: int) -> bool:
         commit = self.content.commit_list[line_number]
@@ -342,23 +467,13 @@ class HistoryControl(BufferControl):
 
     def go_to_link(self, line_number: int):
         try:
-            result = follow(self.working_dir, self.content.commit_list,
-                            line_number)
-
-            if result >= len(self.content.log_entry_list):
-                # sync commit_list with log_entry_list
-                pos = len(self.content.log_entry_list)
-                for commit in self.content.commit_list[pos:]:
-                    entry = LogEntry(commit, self.working_dir,
-                                     self.content.search_state)
-                    self.content.log_entry_list.append(entry)
-            self.goto_line(result)
+            self.goto_line(self.content.follow(line_number))
         except CommitNotFound:
             pass
 
     @property
     def path(self) -> str:
-        return self.path
+        return self._path
 
 
 class HistoryContainer(HSplit):
@@ -2,7 +2,7 @@ import itertools
 import logging
 import re
 import textwrap
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import List, Optional, Tuple
 
 import pkg_resources
@@ -27,6 +27,10 @@ class LogEntry:
         self._working_dir = working_dir
         self.search_state = search_state
         self._colors: dict[str, str] = vcs.CONFIG['history']
+        # (key, styled tuples) of the last rendering, see History
+        self.render_cache: Optional[Tuple[tuple, StyleAndTextTuples]] = None
+        # modules text, set as soon as the modules of the commit are known
+        self._modules: Optional[str] = None
 
     def __getattr__(self, attr: str):
         if attr.endswith('_colored'):
@@ -49,6 +53,9 @@ class LogEntry:
 
     @property
     def modules(self) -> Tuple[str, str]:
+        if self._modules is not None:
+            return self._modules
+
         try:
             config = vcs.CONFIG['history']['modules_content']
         except KeyError:
@@ -60,7 +67,7 @@ class LogEntry:
             modules_max_width = 35
 
         changes: ModuleChanges = mod_changes(self._working_dir)
-        modules = changes.commit_modules(self.commit)
+        modules = list(changes.commit_modules(self.commit))
 
         subject = self.commit.subject
 
@@ -81,6 +88,8 @@ class LogEntry:
         text = ', '.join([':' + x for x in modules])
         if len(text) > modules_max_width:
             text = ':(%d modules)' % len(modules)
+        if changes.is_resolved(self.commit):
+            self._modules = text
         return text
 
     @property
@@ -90,23 +99,18 @@ class LogEntry:
     @property
     @lru_cache
     def author_name(self):
-        width = 10
-        name = self.commit.author_name
-        tmp = textwrap.shorten(name, width=width, placeholder="…")
-        if tmp == '…':
-            return name[0:width - 1] + '…'
-        return tmp
+        return short_author_name(self.commit.author_name)
 
     @property
     @lru_cache
     def icon(self) -> Tuple[str, str]:
         subject = self.commit.subject
         for (regex, icon) in icon_collection():
-            if re.match(regex, subject, flags=re.I):
+            if regex.match(subject):
                 return icon
         return '  '
 
-    @property
+    @cached_property
     def subject(self) -> Tuple[str, str]:
         try:
             parts = vcs.CONFIG['history']['subject_parts'].split()
@@ -204,6 +208,30 @@ class LogEntry:
         return list(itertools.chain(*branch_tupples))
 
 
+_SEARCH_HAYSTACKS: dict[str, str] = {}
+
+
+def search_haystack(commit: Commit) -> str:
+    ''' Return the searchable fields of a commit joined by a NUL byte, so a
+        match can never span two fields.
+    '''
+    try:
+        return _SEARCH_HAYSTACKS[commit.oid]
+    except KeyError:
+        result = '\0'.join(
+            [commit.short_id, commit.subject, commit.author_name] +
+            commit.branches)
+        _SEARCH_HAYSTACKS[commit.oid] = result
+        return result
+
+
+def short_author_name(name: str, width: int = 10) -> str:
+    tmp = textwrap.shorten(name, width=width, placeholder="…")
+    if tmp == '…':
+        return name[0:width - 1] + '…'
+    return tmp
+
+
 def highlight_substring(search: SearchState,
                         parts: Tuple[str, str]) -> StyleAndTextTuples:
     needle: str = search.text
@@ -232,7 +260,8 @@ def highlight_substring(search: SearchState,
     return result
 
 
-def icon_collection():
+@lru_cache
+def icon_collection() -> List[Tuple[re.Pattern, str]]:
     name = vcs.CONFIG['history']['icon_set']
     result = None
     for entry_point in pkg_resources.iter_entry_points(group='glv_icons'):
@@ -244,7 +273,7 @@ def icon_collection():
 
     if not result:
         result = ASCII
-    return result
+    return [(re.compile(regex, flags=re.I), icon) for regex, icon in result]
 
 
 def has_component(subject: str) -> bool:
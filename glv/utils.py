@@ -20,6 +20,7 @@
 ''' A collection of useful functions '''
 import os
 import sys
+from typing import Optional
 
 import pykka
 from prompt_toolkit import __version__ as ptk_version
@@ -42,6 +43,8 @@ else:
     print("Unsupported prompt_toolkit version " + ptk_version, file=sys.stderr)
     sys.exit(1)
 
+_SCREEN_SIZE: Optional[Size] = None
+
 
 def parse_args(**kwargs) -> Repo:
     ''' Parse cli arguments to get the `Repo` object '''
@@ -66,14 +69,25 @@ def screen_width() -> int:
     return _screen_size().columns
 
 
+def reset_screen_size(*_) -> None:
+    ''' Forget the cached screen size, i.e. after the terminal was resized '''
+    global _SCREEN_SIZE  # pylint: disable=global-statement
+    _SCREEN_SIZE = None
+
+
 def _screen_size() -> Size:
     ''' Return the screen size '''
-    if PTK_VERSION == 2:
-        output: Output = get_default_output()
-    else:
-        output: Output = create_output()
+    global _SCREEN_SIZE  # pylint: disable=global-statement
+    size = _SCREEN_SIZE
+    if size is None:
+        if PTK_VERSION == 2:
+            output: Output = get_default_output()
+        else:
+            output: Output = create_output()
 
-    return output.from_pty(sys.stdout).get_size()
+        size = output.from_pty(sys.stdout).get_size()
+        _SCREEN_SIZE = size
+    return size
 
 
 class ModuleChanges:
@@ -109,6 +123,10 @@ class ModuleChanges:
         except pykka.Timeout:
             return []
 
+    def is_resolved(self, commit: Commit) -> bool:
+        ''' Return `True` if the modules of the commit are already known '''
+        return not commit.bellow or commit.oid in self._file_cache
+
 
 _MOD_CHANGES_INSTANCES: dict[str, ModuleChanges] = {}
 